@@ -13,42 +13,135 @@ Requirements:
   pip install termcolor
 
 Usage:
-  python main.py [--timestamp-format {readable,iso}]
+  python main.py [--timestamp-format {readable,iso}] [--sort ...] [--skip-fetch] [--fetch-timeout SECONDS]
 """
 
 from __future__ import annotations
 
 import argparse
+import functools
+import json
+import os
+import re
 import shutil
+import signal
 import subprocess
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple, Iterable
+from typing import Dict, List, Optional, Tuple, Iterable, Iterator
 
 from termcolor import colored
 
 
-@dataclass(frozen=True)
-class BranchInfo:
-    kind: str             # "remote" or "local"
-    display_name: str     # e.g. origin/main or main
-    refname: str          # full ref
-    commit_hash: str
-    committer: str
-    commit_date: datetime # ISO 8601 parsed
-    subject: str
-
-
-def run_git(repo_dir: Path, args: List[str]) -> str:
+@dataclass
+class BranchTable:
+    """
+    Branch tip details stored column-wise: row i of every list describes one branch.
+    Avoids one object per branch and lets sorting work on a single column.
+    """
+    kinds: List[str] = field(default_factory=list)             # "remote" or "local"
+    display_names: List[str] = field(default_factory=list)     # e.g. origin/main or main
+    refnames: List[str] = field(default_factory=list)          # full ref
+    hashes: List[str] = field(default_factory=list)
+    committers: List[str] = field(default_factory=list)
+    timestamps: List[int] = field(default_factory=list)        # unix seconds, used for sorting
+    dates_iso: List[str] = field(default_factory=list)         # ISO 8601 as git printed it
+    subjects: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.refnames)
+
+    def append(self, kind: str, display_name: str, refname: str, commit_hash: str,
+               committer: str, timestamp: int, date_iso: str, subject: str) -> None:
+        self.kinds.append(kind)
+        self.display_names.append(display_name)
+        self.refnames.append(refname)
+        self.hashes.append(commit_hash)
+        self.committers.append(committer)
+        self.timestamps.append(timestamp)
+        self.dates_iso.append(date_iso)
+        self.subjects.append(subject)
+
+    def subset(self, indices: Iterable[int]) -> "BranchTable":
+        """Return a new table containing only the given rows, in the given order."""
+        out = BranchTable()
+        for i in indices:
+            out.append(self.kinds[i], self.display_names[i], self.refnames[i], self.hashes[i],
+                       self.committers[i], self.timestamps[i], self.dates_iso[i], self.subjects[i])
+        return out
+
+
+def run_git(
+    repo_dir: Path,
+    args: List[str],
+    timeout: Optional[float] = None,
+    input: Optional[bytes] = None,
+) -> bytes:
+    """
+    Returns raw stdout. Callers decode only the fields they need; skipping text mode
+    avoids decoding the whole output up front and keeps NUL-separated fields intact.
+    Split records on b"\n" only: splitlines() also breaks on \r, which can occur in
+    commit subjects.
+    """
     cmd = ["git", "-C", str(repo_dir), *args]
-    p = subprocess.run(cmd, capture_output=True, text=True)
-    if p.returncode != 0:
+    if timeout is None:
+        p = subprocess.run(cmd, capture_output=True, input=input)
+        returncode, out, err = p.returncode, p.stdout, p.stderr
+    else:
+        returncode, out, err = run_process_group(cmd, timeout, input)
+    if returncode != 0:
+        stdout = out.decode("utf-8", "replace")
+        stderr = err.decode("utf-8", "replace")
         raise RuntimeError(
-            f"Git command failed:\n  {' '.join(cmd)}\n\nSTDOUT:\n{p.stdout}\n\nSTDERR:\n{p.stderr}"
+            f"Git command failed:\n  {' '.join(cmd)}\n\nSTDOUT:\n{stdout}\n\nSTDERR:\n{stderr}"
         )
-    return p.stdout
+    return out
+
+
+def run_process_group(cmd: List[str], timeout: float, input: Optional[bytes] = None) -> Tuple[int, bytes, bytes]:
+    """
+    Run cmd in its own process group and return (returncode, stdout, stderr).
+    On timeout (or Ctrl-C) the whole group is killed before re-raising. git fetch --all
+    spawns a git fetch per remote plus transport helpers; killing only the top-level
+    process would leave those updating refs, and on Windows reading the pipes would
+    then block until they exit.
+    """
+    if os.name == "nt":
+        group_kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        group_kwargs = {"start_new_session": True}
+    p = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        **group_kwargs,
+    )
+    try:
+        out, err = p.communicate(input, timeout=timeout)
+    except BaseException:
+        kill_process_group(p)
+        p.communicate()
+        raise
+    return p.returncode, out, err
+
+
+def kill_process_group(p: subprocess.Popen) -> None:
+    if os.name == "nt":
+        # /T takes the child processes down too, which closes the pipes they inherited
+        subprocess.run(["taskkill", "/T", "/F", "/PID", str(p.pid)], capture_output=True)
+    else:
+        try:
+            os.killpg(p.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def decode_fields(line: bytes) -> List[str]:
+    """Split a NUL-separated git output line and decode each field."""
+    return [f.decode("utf-8", "replace") for f in line.split(b"\x00")]
 
 
 def ensure_git_repo(repo_dir: Path) -> None:
@@ -56,55 +149,174 @@ def ensure_git_repo(repo_dir: Path) -> None:
         out = run_git(repo_dir, ["rev-parse", "--is-inside-work-tree"]).strip()
     except Exception:
         raise SystemExit("Not a git repository (or git not available).")
-    if out != "true":
+    if out != b"true":
         raise SystemExit("Not inside a git work tree.")
 
 
-def fetch_all_remotes(repo_dir: Path) -> None:
-    # Fetch all remotes and prune deleted branches
-    run_git(repo_dir, ["fetch", "--all", "--prune", "--tags"])
+def fetch_jobs() -> int:
+    """Number of remotes to fetch in parallel; GIT_FETCH_JOBS overrides the default."""
+    # Fetching is network/I/O-bound, so allow more jobs than cores
+    default = min(16, (os.cpu_count() or 4) * 2)
+    env = os.environ.get("GIT_FETCH_JOBS", "").strip()
+    try:
+        jobs = int(env) if env else default
+    except ValueError:
+        jobs = default
+    # --jobs=0 means "let git decide" and has been buggy; always ask for at least 1
+    return max(1, jobs)
+
+
+def fetch_all_remotes(repo_dir: Path, timeout: Optional[float] = None) -> None:
+    # Fetch all remotes (in parallel) and prune deleted branches.
+    # Raises subprocess.TimeoutExpired if the fetch takes longer than timeout seconds;
+    # every process the fetch started has been killed by then.
+    run_git(repo_dir, ["fetch", "--all", "--prune", "--tags", f"--jobs={fetch_jobs()}"], timeout=timeout)
+
+
+def list_remotes(repo_dir: Path) -> List[str]:
+    return run_git(repo_dir, ["remote"]).decode("utf-8", "replace").split()
+
+
+def list_branch_tips(repo_dir: Path, include_remotes: bool = True) -> List[Tuple[str, str, str]]:
+    """
+    Returns list of (full_refname, short_name, commit_hash) for local and remote branches
+    e.g. ("refs/remotes/origin/main", "origin/main", "1a2b3c...")
+    Remote HEAD symrefs (e.g. origin/HEAD) are skipped.
+    """
+    fmt = "%(refname)%00%(refname:short)%00%(objectname)"
+    patterns = ["refs/heads", "refs/remotes"] if include_remotes else ["refs/heads"]
+    stdout = run_git(repo_dir, ["for-each-ref", f"--format={fmt}", *patterns])
+    tips: List[Tuple[str, str, str]] = []
+    for line in stdout.split(b"\n"):
+        if not line.strip():
+            continue
+        parts = decode_fields(line)
+        if len(parts) != 3:
+            continue  # Malformed record: leave this ref out rather than fail the whole report
+        refname, short, h = parts
+        if refname.startswith("refs/remotes/") and short.endswith("/HEAD"):
+            continue
+        tips.append((refname, short, h))
+    return tips
+
 
+# (committer, unix_timestamp, iso_date, subject) for one commit
+CommitDetails = Tuple[str, int, str, str]
 
-def list_remote_branches(repo_dir: Path) -> List[Tuple[str, str]]:
+
+def get_commit_details(repo_dir: Path, hashes: List[str]) -> Dict[str, CommitDetails]:
     """
-    Returns list of (full_refname, short_name) for remote branches
-    e.g. ("refs/remotes/origin/main", "origin/main")
+    Returns {hash: (committer, unix_timestamp, iso_date, subject)} for the given commits
+    in one git log call.
+    Hashes are fed on stdin so any number of them fits in a single process
+    (a command line would hit the OS length limit, ~32K chars on Windows).
     """
-    stdout = run_git(repo_dir, ["for-each-ref", "--format=%(refname:short)", "refs/remotes"])
-    shorts = [line.strip() for line in stdout.splitlines() if line.strip()]
-    shorts = [s for s in shorts if not s.endswith("/HEAD")]
-    return [(f"refs/remotes/{s}", s) for s in shorts]
+    if not hashes:
+        return {}
+    # Trailing %x00 terminates each record, so one cut short by a stray line break
+    # in the subject shows up as malformed instead of being silently truncated
+    fmt = "%H%x00%cn%x00%ct%x00%cd%x00%s%x00"
+    stdout = run_git(
+        repo_dir,
+        ["log", "--no-walk=unsorted", "--stdin", f"--format={fmt}", "--date=iso-strict"],
+        input="".join(f"{h}\n" for h in hashes).encode("ascii"),
+    )
+    details: Dict[str, CommitDetails] = {}
+    for line in stdout.split(b"\n"):
+        if not line:
+            continue
+        parts = decode_fields(line)
+        if len(parts) != 6 or parts[5] or not parts[2].isdigit():
+            continue  # Malformed record: branches on this commit are left out rather than fail the report
+        details[parts[0]] = (parts[1], int(parts[2]), parts[3], parts[4])
+    return details
+
+
+# ----------------------------
+# Commit detail cache
+# ----------------------------
+
+CACHE_FILE_NAME = "branch-report-cache.json"
+
+
+def cache_path(repo_dir: Path) -> Path:
+    # Entries are keyed only by commit hash, so keep one cache in the common git dir
+    # shared by every worktree rather than one per worktree
+    common_dir = os.fsdecode(run_git(repo_dir, ["rev-parse", "--git-common-dir"]).strip())
+    return repo_dir / common_dir / CACHE_FILE_NAME
 
 
-def list_local_branches(repo_dir: Path) -> List[Tuple[str, str]]:
+def load_commit_cache(path: Path) -> Dict[str, CommitDetails]:
     """
-    Returns list of (full_refname, short_name) for local branches
-    e.g. ("refs/heads/main", "main")
+    Cache maps commit hash -> (committer, unix_timestamp, iso_date, subject).
+    Commit hashes are content-addressed, so entries never go stale; a missing
+    or unreadable cache just means everything gets looked up again.
     """
-    stdout = run_git(repo_dir, ["for-each-ref", "--format=%(refname:short)", "refs/heads"])
-    shorts = [line.strip() for line in stdout.splitlines() if line.strip()]
-    return [(f"refs/heads/{s}", s) for s in shorts]
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        return {
+            h: (entry["committer"], int(entry["commit_timestamp"]), entry["commit_date_iso"], entry["subject"])
+            for h, entry in raw.items()
+        }
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return {}
+
+
+def save_commit_cache(path: Path, cache: Dict[str, CommitDetails]) -> None:
+    data = {
+        h: {"committer": c, "commit_timestamp": ts, "commit_date_iso": d, "subject": s}
+        for h, (c, ts, d, s) in cache.items()
+    }
+    try:
+        path.write_text(json.dumps(data), encoding="utf-8")
+    except OSError:
+        pass  # Cache is best-effort (e.g. read-only repo)
 
 
-def get_latest_commit(repo_dir: Path, refname: str) -> Tuple[str, str, datetime, str]:
+def list_all_branches(repo_dir: Path, include_remotes: bool = True) -> Tuple[BranchTable, BranchTable]:
     """
-    Returns (hash, committer, date_datetime, subject) for the tip commit of ref.
-    Merge commits are included automatically if they are the tip.
+    Returns (remote_table, local_table) with tip commit details for every branch.
+    Details for tips seen on a previous run come from the cache; the rest are
+    looked up in one git log call and written back.
     """
-    fmt = "%H%x00%cn%x00%cd%x00%s"
-    stdout = run_git(repo_dir, ["log", "-1", f"--format={fmt}", "--date=iso-strict", refname]).rstrip("\n")
-    parts = stdout.split("\x00")
-    if len(parts) != 4:
-        raise RuntimeError(f"Unexpected log format for {refname}: {stdout!r}")
-    date_obj = datetime.fromisoformat(parts[2])
-    return parts[0], parts[1], date_obj, parts[3]
+    tips = list_branch_tips(repo_dir, include_remotes)
+
+    path = cache_path(repo_dir)
+    cached = load_commit_cache(path)
+    # Many refs share a tip (main vs origin/main, the same branch on several remotes);
+    # details depend only on the hash, so look each unseen hash up once
+    misses = list(dict.fromkeys(h for _, _, h in tips if h not in cached))
+    fresh = get_commit_details(repo_dir, misses)
+
+    # Keep only tips that are still referenced so the cache doesn't grow forever
+    current = {**cached, **fresh}
+    pruned = {h: current[h] for _, _, h in tips if h in current}
+    if fresh or pruned.keys() != cached.keys():
+        save_commit_cache(path, pruned)
+
+    remote_table = BranchTable()
+    local_table = BranchTable()
+    for refname, short, h in tips:
+        if h not in pruned:
+            continue
+        c, ts, d, subj = pruned[h]
+        if refname.startswith("refs/remotes/"):
+            remote_table.append("remote", short, refname, h, c, ts, d, subj)
+        else:
+            local_table.append("local", short, refname, h, c, ts, d, subj)
+    return remote_table, local_table
 
 
 # ----------------------------
 # Terminal formatting helpers
 # ----------------------------
 
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+@functools.lru_cache(maxsize=1)
 def term_width(default: int = 100) -> int:
+    # Memoized: the width is looked up once per run however often it is asked for
     try:
         return shutil.get_terminal_size(fallback=(default, 24)).columns
     except Exception:
@@ -116,13 +328,13 @@ def strip_ansi_len(s: str) -> int:
     Best-effort visible length. termcolor uses ANSI escapes.
     We'll approximate by removing ESC sequences.
     """
-    import re
-    ansi_re = re.compile(r"\x1b\[[0-9;]*m")
-    return len(ansi_re.sub("", s))
+    if "\x1b" not in s:
+        return len(s)
+    return len(_ANSI_RE.sub("", s))
 
 
 def wrap_pieces(
-    pieces: Iterable[str],
+    pieces: Iterable[Tuple[str, int]],
     *,
     width: int,
     first_prefix: str = "",
@@ -134,30 +346,45 @@ def wrap_pieces(
       - if the next piece would exceed width, it starts a new line
     This is more readable than plain word-wrap because it respects your logical chunks.
 
-    pieces should already include any spaces they need (e.g. "  " or " | ").
+    pieces are (text, visible_length) pairs; text may contain ANSI color codes and
+    should already include any spaces it needs (e.g. "  " or " | "). Passing the
+    visible length in keeps this linear instead of re-measuring the growing line.
     """
+    pieces = list(pieces)
+    first_len = strip_ansi_len(first_prefix)
+
+    # Common case: everything fits on one line, so skip the piece-by-piece walk
+    if first_len + sum(piece_len for _, piece_len in pieces) <= width:
+        line = first_prefix + "".join(piece for piece, _ in pieces)
+        return [line.rstrip()] if line.strip() else []
+
     lines: List[str] = []
+    next_len = strip_ansi_len(next_prefix)
     cur = first_prefix
+    cur_len = first_len
 
-    for piece in pieces:
+    for piece, piece_len in pieces:
         if not piece:
             continue
 
         # If the piece itself is longer than width, just force it onto a new line.
         # (We won't hard-wrap inside the piece; that’s intentional.)
-        proposed = cur + piece
-        if strip_ansi_len(proposed) <= width or strip_ansi_len(cur) <= strip_ansi_len(first_prefix):
-            cur = proposed
+        if cur_len + piece_len <= width or cur_len <= first_len:
+            cur += piece
+            cur_len += piece_len
             continue
 
         # Start a new line
         lines.append(cur.rstrip())
-        cur = next_prefix + piece.lstrip()
+        stripped = piece.lstrip()
+        cur = next_prefix + stripped
+        cur_len = next_len + piece_len - (len(piece) - len(stripped))
 
         # If still too long, keep as-is (no internal wrapping).
-        if strip_ansi_len(cur) > width:
+        if cur_len > width:
             lines.append(cur.rstrip())
             cur = next_prefix
+            cur_len = next_len
 
     if cur.strip():
         lines.append(cur.rstrip())
@@ -165,13 +392,19 @@ def wrap_pieces(
     return lines
 
 
+_MONTH_ABBR = ["Jan.", "Feb.", "Mar.", "Apr.", "May.", "Jun.",
+               "Jul.", "Aug.", "Sep.", "Oct.", "Nov.", "Dec."]
+_ORDINALS = ["th", "st", "nd", "rd"] + ["th"] * 6  # indexed by day % 10
+
+
 def format_date(dt: datetime) -> str:
-    month = dt.strftime('%b').capitalize() + '.'
+    # Lookup tables and plain formatting instead of strftime, which is slow per call
+    month = _MONTH_ABBR[dt.month - 1]
     day = dt.day
-    ordinal = 'th' if 11 <= day <= 13 else {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th')
+    ordinal = 'th' if 11 <= day <= 13 else _ORDINALS[day % 10]
     day_str = f"{day}{ordinal}"
     year = dt.year
-    time_str = dt.strftime('%I:%M:%S %p')
+    time_str = f"{(dt.hour % 12) or 12:02d}:{dt.minute:02d}:{dt.second:02d} {'AM' if dt.hour < 12 else 'PM'}"
     offset = dt.utcoffset()
     if offset is not None:
         hours = int(offset.total_seconds() / 3600)
@@ -181,28 +414,18 @@ def format_date(dt: datetime) -> str:
     return f"{month} {day_str}, {year}, {time_str}, {tz_str}"
 
 
-def print_block(lines: List[str]) -> None:
-    for ln in lines:
-        print(ln)
-
-
 # ----------------------------
 # Main output logic
 # ----------------------------
 
-def build_branch_info(repo_dir: Path, kind: str, refname: str, display: str) -> BranchInfo:
-    h, c, d, s = get_latest_commit(repo_dir, refname)
-    return BranchInfo(kind=kind, display_name=display, refname=refname, commit_hash=h, committer=c, commit_date=d, subject=s)
-
-
-def local_branches_not_on_any_remote(local_shorts: List[str], remote_shorts: List[str]) -> List[str]:
+def local_branches_not_on_any_remote(local_shorts: Iterable[str], remote_shorts: Iterable[str]) -> Iterator[str]:
     """
-    Return local branches that have no corresponding remote branch.
+    Yield local branches that have no corresponding remote branch.
     We treat local 'foo' as corresponding if any remote branch ends with '/foo'
     (e.g. origin/foo, upstream/foo).
     """
-    remote_leaf_names = {r.split("/", 1)[1] for r in remote_shorts if "/" in r}
-    return [l for l in local_shorts if l not in remote_leaf_names]
+    remote_leaf_names = frozenset(r.split("/", 1)[1] for r in remote_shorts if "/" in r)
+    return (l for l in local_shorts if l not in remote_leaf_names)
 
 
 def remote_has_local_tracking(remote_short: str, local_shorts: List[str]) -> bool:
@@ -219,107 +442,125 @@ def main() -> int:
                         help='Format for timestamps: readable (default) or iso')
     parser.add_argument('--sort', choices=['newest', 'oldest', 'latest', 'earliest', 'index'], default='newest',
                         help='Sort order: newest/latest (default, latest first), oldest/earliest (oldest first), index (git index order)')
+    parser.add_argument('--skip-fetch', action='store_true',
+                        help='Do not fetch remotes; report on the remote-tracking refs as they are')
+    parser.add_argument('--fetch-timeout', type=float, default=None, metavar='SECONDS',
+                        help='Give up fetching after this many seconds and report on the existing refs')
     args = parser.parse_args()
 
     repo_dir = Path.cwd()
     ensure_git_repo(repo_dir)
 
+    # With no remotes there is nothing to fetch or compare against: every local
+    # branch is local-only and only that section is shown.
+    has_remotes = bool(list_remotes(repo_dir))
+
     # Fetch updates
-    try:
-        fetch_all_remotes(repo_dir)
-    except RuntimeError as e:
-        print(colored("Error fetching remotes:", "red"), str(e), file=sys.stderr)
-        return 2
+    if has_remotes and not args.skip_fetch:
+        try:
+            fetch_all_remotes(repo_dir, timeout=args.fetch_timeout)
+        except subprocess.TimeoutExpired:
+            print(colored(f"Fetch timed out after {args.fetch_timeout:g}s; showing existing refs.", "yellow"),
+                  file=sys.stderr)
+        except RuntimeError as e:
+            print(colored("Error fetching remotes:", "red"), str(e), file=sys.stderr)
+            return 2
 
     width = term_width()
 
-    # Collect branches
-    remote_refs = list_remote_branches(repo_dir)
-    local_refs = list_local_branches(repo_dir)
+    # Collect branches (tip commit details come back with the listing)
+    remote_table, local_table = list_all_branches(repo_dir, include_remotes=has_remotes)
 
-    remote_shorts = [short for _, short in remote_refs]
-    local_shorts_list = [short for _, short in local_refs]
+    sections: List[Tuple[str, BranchTable]]
+    if not has_remotes:
+        sections = [("Local Only", local_table)]
+    else:
+        remote_shorts = remote_table.display_names
+        local_shorts_list = local_table.display_names
 
-    remote_only_infos: List[BranchInfo] = []
-    remote_tracked_infos: List[BranchInfo] = []
-    for full_ref, short in remote_refs:
-        try:
+        remote_only_rows: List[int] = []
+        remote_tracked_rows: List[int] = []
+        for i, short in enumerate(remote_shorts):
             if remote_has_local_tracking(short, local_shorts_list):
-                remote_tracked_infos.append(build_branch_info(repo_dir, "remote_tracked", full_ref, short))
+                remote_tracked_rows.append(i)
             else:
-                remote_only_infos.append(build_branch_info(repo_dir, "remote_only", full_ref, short))
-        except RuntimeError:
-            continue
-
-    # Local-only: those not corresponding to any remote branch name
-    local_only_short_names = set(local_branches_not_on_any_remote(local_shorts_list, remote_shorts))
-
-    local_only_infos: List[BranchInfo] = []
-    for full_ref, short in local_refs:
-        if short not in local_only_short_names:
-            continue
-        try:
-            local_only_infos.append(build_branch_info(repo_dir, "local", full_ref, short))
-        except RuntimeError:
-            continue
-
-    # Sort based on --sort option
-    all_lists = [remote_only_infos, remote_tracked_infos, local_only_infos]
-    if args.sort in ('newest', 'latest'):
-        for lst in all_lists:
-            lst.sort(key=lambda b: b.commit_date, reverse=True)
-    elif args.sort in ('oldest', 'earliest'):
-        for lst in all_lists:
-            lst.sort(key=lambda b: b.commit_date, reverse=False)
-    elif args.sort == 'index':
-        # Keep order as returned by git for-each-ref (typically alphabetical)
-        pass
+                remote_only_rows.append(i)
+
+        # Local-only: those not corresponding to any remote branch name
+        local_only_short_names = set(local_branches_not_on_any_remote(local_shorts_list, remote_shorts))
+        local_only_rows = [i for i, short in enumerate(local_shorts_list) if short in local_only_short_names]
+
+        sections = [
+            ("Remote Only", remote_table.subset(remote_only_rows)),
+            ("Remote + Tracked", remote_table.subset(remote_tracked_rows)),
+            ("Local Only", local_table.subset(local_only_rows)),
+        ]
+
+    def row_order(table: BranchTable) -> List[int]:
+        """Row indices in --sort order; the table itself is left as-is."""
+        if args.sort in ('newest', 'latest'):
+            return sorted(range(len(table)), key=table.timestamps.__getitem__, reverse=True)
+        if args.sort in ('oldest', 'earliest'):
+            return sorted(range(len(table)), key=table.timestamps.__getitem__)
+        # index: keep order as returned by git for-each-ref (typically alphabetical)
+        return list(range(len(table)))
 
     # Header
     title = f"Latest commits per branch in {repo_dir.name}"
-    print(colored(title, "cyan", attrs=["bold"]))
-    print(colored("-" * min(width, max(10, len(title))), "cyan"))
-    print()
-
-    def print_section(label: str, infos: List[BranchInfo]) -> None:
-        print(colored(label, "cyan", attrs=["bold"]))
-        if not infos:
-            print(colored("  (none)", "yellow"))
-            print()
+    # The whole report is collected here and written in one go at the end
+    out: List[str] = [
+        colored(title, "cyan", attrs=["bold"]),
+        colored("-" * min(width, max(10, len(title))), "cyan"),
+        "",
+    ]
+
+    # Pick the date formatter once. Only the readable format needs a datetime;
+    # ISO is shown exactly as git printed it.
+    if args.timestamp_format == 'iso':
+        def fmt_date(iso: str) -> str:
+            return iso
+    else:
+        def fmt_date(iso: str) -> str:
+            return format_date(datetime.fromisoformat(iso))
+
+    def print_section(label: str, table: BranchTable) -> None:
+        out.append(colored(label, "cyan", attrs=["bold"]))
+        if not len(table):
+            out.append(colored("  (none)", "yellow"))
+            out.append("")
             return
 
-        for b in infos:
-            branch = colored(b.display_name, "green", attrs=["bold"])
-            chash = colored(b.commit_hash[:12], "yellow")
-            if args.timestamp_format == 'iso':
-                cdate = colored(b.commit_date.isoformat(), "magenta")
-            else:
-                cdate = colored(format_date(b.commit_date), "magenta")
-            comm = colored(b.committer, "blue")
-            msg = colored(b.subject, "white")
+        sep = ("  ", 2)
+        for i in row_order(table):
+            date_text = fmt_date(table.dates_iso[i])
+            name = table.display_names[i]
+            short_hash = table.hashes[i][:12]
+            committer = table.committers[i]
+            subject = table.subjects[i]
 
             # Compose into "pieces" so the wrapper can break at sensible boundaries.
+            # Visible lengths are taken from the raw text, before coloring.
             pieces = [
-                branch,
-                "  ",
-                chash,
-                "  ",
-                cdate,
-                "  ",
-                comm,
-                "  ",
-                msg,
+                (colored(name, "green", attrs=["bold"]), len(name)),
+                sep,
+                (colored(short_hash, "yellow"), len(short_hash)),
+                sep,
+                (colored(date_text, "magenta"), len(date_text)),
+                sep,
+                (colored(committer, "blue"), len(committer)),
+                sep,
+                (colored(subject, "white"), len(subject)),
             ]
 
             # Indent subsequent lines for readability
-            lines = wrap_pieces(pieces, width=width, first_prefix="  ", next_prefix="    ")
-            print_block(lines)
+            out.extend(wrap_pieces(pieces, width=width, first_prefix="  ", next_prefix="    "))
+
+        out.append("")
 
-        print()
+    for label, table in sections:
+        print_section(label, table)
 
-    print_section("Remote Only", remote_only_infos)
-    print_section("Remote + Tracked", remote_tracked_infos)
-    print_section("Local Only", local_only_infos)
+    sys.stdout.write("\n".join(out) + "\n")
 
     return 0
 